@@ -0,0 +1,262 @@
+"""
+Load Tester for the LangChain Greeter + Weather Agent
+Fires prompts at the /chat endpoint from a thread pool and records per-request timings
+"""
+import csv
+import io
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+# Pause after a failed request so a down agent isn't hammered in a tight loop
+ERROR_BACKOFF = 0.5
+
+RESULT_FIELDS = ["started", "ttfb", "latency", "status", "error", "prompt"]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def send_request(session, api_url, prompt, stream, timeout=30):
+    """
+    Send a single chat request and time it.
+
+    Args:
+        session: requests.Session to send the request on
+        api_url: URL of the agent /chat endpoint
+        prompt: User message to send
+        stream: Whether to request a Server-Sent Events response
+        timeout: Request timeout in seconds
+
+    Returns:
+        Dict with ttfb, latency (seconds), HTTP status and error category (or None)
+    """
+    payload = {
+        "messages": [
+            {"role": "user", "content": prompt}
+        ],
+        "stream": stream
+    }
+    start = time.perf_counter()
+    ttfb = None
+    status = None
+    error = None
+
+    try:
+        with session.post(api_url, json=payload, stream=True, timeout=timeout) as response:
+            status = response.status_code
+            body = b""
+            for chunk in response.iter_content(chunk_size=None):
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+                body += chunk
+
+            if status != 200:
+                error = f"HTTP {status}"
+            elif stream:
+                for line in body.decode("utf-8", errors="replace").splitlines():
+                    if line.startswith("data: ") and json.loads(line[6:]).get("type") == "error":
+                        error = "Agent error"
+                        break
+    except requests.exceptions.Timeout:
+        error = "Timeout"
+    except requests.exceptions.ConnectionError as e:
+        # A read timeout while streaming the body surfaces from iter_content as a
+        # ConnectionError wrapping urllib3's ReadTimeoutError
+        if e.args and isinstance(e.args[0], ReadTimeoutError):
+            error = "Timeout"
+        else:
+            error = "Connection error"
+    except Exception as e:
+        error = type(e).__name__
+
+    return {
+        "ttfb": ttfb,
+        "latency": time.perf_counter() - start,
+        "status": status,
+        "error": error
+    }
+
+
+class LoadTest:
+    """Closed-loop load test: each worker sends requests back to back until the deadline"""
+
+    def __init__(self, api_url, prompts, concurrency, duration, stream, timeout=30):
+        self.api_url = api_url
+        self.prompts = list(prompts)
+        self.concurrency = concurrency
+        self.duration = duration
+        self.stream = stream
+        self.timeout = timeout
+        self.results = []
+        self.started_at = None
+        self.stopped = False
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._executor = None
+        self._futures = []
+
+    def start(self):
+        """Start the worker pool (non-blocking)"""
+        self.started_at = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._futures = [
+            self._executor.submit(self._worker, index)
+            for index in range(self.concurrency)
+        ]
+        self._executor.shutdown(wait=False)
+
+    def stop(self):
+        """Ask workers to finish after their in-flight request"""
+        self.stopped = self.running
+        self._stop.set()
+
+    def wait(self, timeout=None):
+        """Block until every worker has finished (or timeout seconds pass)"""
+        wait(self._futures, timeout=timeout)
+
+    @property
+    def running(self):
+        return any(not future.done() for future in self._futures)
+
+    @property
+    def elapsed(self):
+        return 0.0 if self.started_at is None else time.perf_counter() - self.started_at
+
+    def drain(self):
+        """Move results finished since the last call into self.results and return them"""
+        new_results = []
+        while True:
+            try:
+                new_results.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self.results.extend(new_results)
+        return new_results
+
+    def _worker(self, index):
+        # One keep-alive session per worker; requests.Session is not thread-safe
+        session = requests.Session()
+        deadline = self.started_at + self.duration
+        sent = 0
+        try:
+            while not self._stop.is_set() and time.perf_counter() < deadline:
+                prompt = self.prompts[(index + sent * self.concurrency) % len(self.prompts)]
+                started = time.perf_counter() - self.started_at
+                result = send_request(session, self.api_url, prompt, self.stream, self.timeout)
+                result.update({"started": started, "prompt": prompt})
+                self._queue.put(result)
+                sent += 1
+                if result["error"] is not None:
+                    self._stop.wait(ERROR_BACKOFF)
+        finally:
+            session.close()
+
+    def timeline(self, bucket=1.0, window=10.0):
+        """
+        Aggregate results into fixed time buckets by completion time.
+
+        Every bucket from the start of the run to the last completion is
+        included, so seconds with no completions show zero throughput.
+        Percentiles are computed over successful requests that finished in the
+        trailing `window` seconds, since a single bucket holds too few samples.
+
+        Returns:
+            List of dicts with second, throughput (successful req/s), errors and
+            TTFB / latency percentiles in milliseconds (None if no samples)
+        """
+        finished = sorted(
+            ((r["started"] + r["latency"], r) for r in self.results),
+            key=lambda item: item[0]
+        )
+        if not finished:
+            return []
+
+        rows = []
+        first = 0  # index of the oldest result still inside the trailing window
+        last = 0   # index of the first result not yet in any bucket
+        for key in range(int(finished[-1][0] // bucket) + 1):
+            end = (key + 1) * bucket
+            items = []
+            while last < len(finished) and finished[last][0] < end:
+                items.append(finished[last][1])
+                last += 1
+            while finished[first][0] < end - window:
+                first += 1
+
+            recent = [r for _, r in finished[first:last] if r["error"] is None]
+            latencies = [r["latency"] * 1000 for r in recent]
+            ttfbs = [r["ttfb"] * 1000 for r in recent if r["ttfb"] is not None]
+            errors = sum(1 for r in items if r["error"] is not None)
+            rows.append({
+                "second": key * bucket,
+                "throughput": (len(items) - errors) / bucket,
+                "errors": errors,
+                "ttfb_p50": percentile(ttfbs, 50),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "latency_p99": percentile(latencies, 99)
+            })
+        return rows
+
+    def summary(self):
+        """Overall statistics for the run"""
+        ok = [r for r in self.results if r["error"] is None]
+        latencies = [r["latency"] * 1000 for r in ok]
+        ttfbs = [r["ttfb"] * 1000 for r in ok if r["ttfb"] is not None]
+        elapsed = max((r["started"] + r["latency"] for r in self.results), default=0.0) or 1.0
+        return {
+            "api_url": self.api_url,
+            "stream": self.stream,
+            "concurrency": self.concurrency,
+            "duration": self.duration,
+            "elapsed": elapsed,
+            "requests": len(self.results),
+            "errors": len(self.results) - len(ok),
+            "stopped": self.stopped,
+            # throughput counts successful requests only; request_rate includes errors
+            "throughput": len(ok) / elapsed,
+            "request_rate": len(self.results) / elapsed,
+            "ttfb_p50_ms": percentile(ttfbs, 50),
+            "ttfb_p95_ms": percentile(ttfbs, 95),
+            "latency_p50_ms": percentile(latencies, 50),
+            "latency_p95_ms": percentile(latencies, 95),
+            "latency_p99_ms": percentile(latencies, 99),
+            "latency_max_ms": max(latencies) if latencies else None
+        }
+
+    def error_breakdown(self):
+        """Count of failed requests per error category"""
+        counts = {}
+        for result in self.results:
+            if result["error"] is not None:
+                counts[result["error"]] = counts.get(result["error"], 0) + 1
+        return counts
+
+    def to_json(self):
+        """Export summary, error breakdown and raw results as a JSON string"""
+        return json.dumps({
+            "summary": self.summary(),
+            "errors": self.error_breakdown(),
+            "results": self.results
+        }, indent=2)
+
+    def to_csv(self):
+        """Export raw per-request results as a CSV string"""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(self.results)
+        return output.getvalue()
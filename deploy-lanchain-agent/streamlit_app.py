@@ -5,8 +5,13 @@ Test the agent deployed in Podman container
 import streamlit as st
 import requests
 import json
+import time
 from datetime import datetime
 
+import pandas as pd
+
+from load_tester import LoadTest
+
 # Page configuration
 st.set_page_config(
     page_title="LangChain Agent Tester",
@@ -48,9 +53,111 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Example prompts (also used by the load test)
+EXAMPLE_PROMPTS = [
+    "My name is John and I'm in New York",
+    "Hi, I'm Sarah from San Francisco",
+    "I'm Mike in Chicago, what's the weather like?",
+    "My name is Alice and I'm in Boston"
+]
+
+# Chat message rendering
+MESSAGE_LABELS = {
+    "user": "You",
+    "agent": "Agent",
+    "step": "Step",
+    "error": "Error"
+}
+
+
+def get_http_session():
+    """Keep-alive HTTP session for this browser session
+
+    Stored per user in st.session_state rather than shared through
+    st.cache_resource, because requests.Session is not thread-safe and each
+    user's script runs on its own thread.
+    """
+    if 'http_session' not in st.session_state:
+        st.session_state.http_session = requests.Session()
+    return st.session_state.http_session
+
+
+def show_newest_page():
+    """Send-button callback: reset history paging before the rerun renders it"""
+    st.session_state.history_page = 0
+
+
+def format_message(message):
+    """Build the HTML block for a single chat message"""
+    label = MESSAGE_LABELS[message["role"]]
+    return (
+        f'<div class="chat-message {message["role"]}-message">'
+        f'<strong>{label}:</strong> {message["content"]}</div>'
+    )
+
+
+def render_message(message, target=None):
+    """Render a chat message into the given placeholder (or the page)"""
+    if message["role"] == "step" and not show_cot:
+        return
+    target = st if target is None else target
+    target.markdown(format_message(message), unsafe_allow_html=True)
+
+
+def add_message(role, content):
+    """Append a message to the chat history and return it"""
+    message = {
+        "role": role,
+        "content": content,
+        "timestamp": datetime.now().isoformat()
+    }
+    st.session_state.messages.append(message)
+    return message
+
+
+def render_load_test(test, view):
+    """Draw metrics, live charts and error breakdown for a load test run"""
+    summary = test.summary()
+
+    def fmt_ms(value):
+        return "–" if value is None else f"{value:.0f} ms"
+
+    m1, m2, m3, m4, m5 = view["metrics"].container().columns(5)
+    m1.metric("Requests", summary["requests"])
+    m2.metric(
+        "Throughput",
+        f"{summary['throughput']:.2f} req/s",
+        help=f"Successful requests only ({summary['request_rate']:.2f} req/s including errors)"
+    )
+    m3.metric("TTFB p50", fmt_ms(summary["ttfb_p50_ms"]))
+    m4.metric("Latency p95", fmt_ms(summary["latency_p95_ms"]))
+    m5.metric("Errors", summary["errors"])
+
+    timeline = test.timeline()
+    if timeline:
+        frame = pd.DataFrame(timeline).set_index("second")
+        view["throughput"].line_chart(frame[["throughput", "errors"]])
+        view["latency"].line_chart(frame[["ttfb_p50", "latency_p50", "latency_p95", "latency_p99"]])
+
+    errors = test.error_breakdown()
+    if errors:
+        view["errors"].bar_chart(pd.Series(errors, name="count"))
+    else:
+        view["errors"].caption("No errors")
+
+
 # Title
 st.markdown('<h1 class="main-header">🤖 LangChain Agent Tester</h1>', unsafe_allow_html=True)
 
+# A rerun from any interaction ends a load test still in flight from the previous
+# script run, before the sidebar or chat tab can send a request alongside it
+previous_test = st.session_state.get('load_test')
+if previous_test is not None and previous_test.running:
+    previous_test.stop()
+    with st.spinner("⏹️ Stopping load test: waiting for in-flight requests..."):
+        previous_test.wait()
+    previous_test.drain()
+
 # Sidebar configuration
 with st.sidebar:
     st.header("⚙️ Configuration")
@@ -73,13 +180,22 @@ with st.sidebar:
         help="Display intermediate reasoning steps"
     )
     
+    history_window = st.number_input(
+        "Messages per page",
+        min_value=10,
+        max_value=500,
+        value=50,
+        step=10,
+        help="Only this many chat messages are rendered at once; older ones are paginated"
+    )
+    
     st.divider()
     
     # Test connection
     if st.button("🔍 Test Connection"):
         try:
             health_url = api_url.replace("/chat", "/health")
-            response = requests.get(health_url, timeout=5)
+            response = get_http_session().get(health_url, timeout=5)
             if response.status_code == 200:
                 st.success("✅ Agent is online!")
                 st.json(response.json())
@@ -92,14 +208,7 @@ with st.sidebar:
     
     # Example prompts
     st.subheader("📝 Example Prompts")
-    example_prompts = [
-        "My name is John and I'm in New York",
-        "Hi, I'm Sarah from San Francisco",
-        "I'm Mike in Chicago, what's the weather like?",
-        "My name is Alice and I'm in Boston"
-    ]
-    
-    for prompt in example_prompts:
+    for prompt in EXAMPLE_PROMPTS:
         if st.button(prompt, key=f"example_{prompt}"):
             st.session_state.user_input = prompt
 
@@ -107,165 +216,236 @@ with st.sidebar:
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 
-# Main chat interface
-st.subheader("💬 Chat with the Agent")
+if 'history_page' not in st.session_state:
+    st.session_state.history_page = 0
 
-# Display chat history
-for message in st.session_state.messages:
-    if message["role"] == "user":
-        st.markdown(
-            f'<div class="chat-message user-message"><strong>You:</strong> {message["content"]}</div>',
-            unsafe_allow_html=True
-        )
-    elif message["role"] == "agent":
-        st.markdown(
-            f'<div class="chat-message agent-message"><strong>Agent:</strong> {message["content"]}</div>',
-            unsafe_allow_html=True
-        )
-    elif message["role"] == "step" and show_cot:
-        st.markdown(
-            f'<div class="chat-message step-message"><strong>Step:</strong> {message["content"]}</div>',
-            unsafe_allow_html=True
-        )
-    elif message["role"] == "error":
-        st.markdown(
-            f'<div class="chat-message error-message"><strong>Error:</strong> {message["content"]}</div>',
-            unsafe_allow_html=True
-        )
 
-# Chat input
-user_input = st.text_input(
-    "Your message:",
-    key="user_input",
-    placeholder="Type your message here... (e.g., 'My name is John and I'm in New York')"
-)
+# Main interface
+chat_tab, load_tab = st.tabs(["💬 Chat", "📈 Load Test"])
 
-col1, col2, col3 = st.columns([1, 1, 4])
+with chat_tab:
+    st.subheader("💬 Chat with the Agent")
 
-with col1:
-    send_button = st.button("📤 Send", type="primary", use_container_width=True)
+    # Display chat history, one page at a time so long chats stay cheap to render
+    messages = st.session_state.messages
+    page_count = max(1, -(-len(messages) // history_window))
+    page = min(st.session_state.history_page, page_count - 1)
 
-with col2:
-    clear_button = st.button("🗑️ Clear Chat", use_container_width=True)
+    if page_count > 1:
+        nav_older, nav_info, nav_newer = st.columns([1, 2, 1])
+        with nav_older:
+            if st.button("⬅️ Older", disabled=page >= page_count - 1, use_container_width=True):
+                st.session_state.history_page = page + 1
+                st.rerun()
+        with nav_info:
+            st.caption(f"Page {page_count - page} of {page_count} · {len(messages)} messages")
+        with nav_newer:
+            if st.button("Newer ➡️", disabled=page == 0, use_container_width=True):
+                st.session_state.history_page = page - 1
+                st.rerun()
 
-if clear_button:
-    st.session_state.messages = []
-    st.rerun()
-
-# Send message
-if send_button and user_input:
-    # Add user message to history
-    st.session_state.messages.append({
-        "role": "user",
-        "content": user_input,
-        "timestamp": datetime.now().isoformat()
-    })
-    
-    # Prepare request
-    payload = {
-        "messages": [
-            {"role": "user", "content": user_input}
-        ],
-        "stream": use_streaming
-    }
-    
-    try:
-        with st.spinner("🤔 Agent is thinking..."):
+    window_end = len(messages) - page * history_window
+    window_start = max(0, window_end - history_window)
+    for message in messages[window_start:window_end]:
+        render_message(message)
+
+    # New messages from this send are rendered here, below the history
+    live_area = st.container()
+
+    # Chat input
+    user_input = st.text_input(
+        "Your message:",
+        key="user_input",
+        placeholder="Type your message here... (e.g., 'My name is John and I'm in New York')"
+    )
+
+    col1, col2, col3 = st.columns([1, 1, 4])
+
+    with col1:
+        send_button = st.button("📤 Send", type="primary", use_container_width=True, on_click=show_newest_page)
+
+    with col2:
+        clear_button = st.button("🗑️ Clear Chat", use_container_width=True)
+
+    if clear_button:
+        st.session_state.messages = []
+        st.session_state.history_page = 0
+        st.rerun()
+
+    # Send message
+    if send_button and user_input:
+        render_message(add_message("user", user_input), live_area)
+
+        # Prepare request
+        payload = {
+            "messages": [
+                {"role": "user", "content": user_input}
+            ],
+            "stream": use_streaming
+        }
+
+        session = get_http_session()
+        status = live_area.empty()
+        status.caption("🤔 Agent is thinking...")
+
+        try:
             if use_streaming:
-                # Streaming request
-                response = requests.post(
-                    api_url,
-                    json=payload,
-                    stream=True,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    agent_response = ""
-                    steps = []
-                    
-                    for line in response.iter_lines():
-                        if line:
+                # Streaming request: render each event as it arrives
+                with session.post(api_url, json=payload, stream=True, timeout=30) as response:
+                    if response.status_code == 200:
+                        agent_response = ""
+                        agent_placeholder = None
+
+                        for line in response.iter_lines():
+                            if not line:
+                                continue
                             line = line.decode('utf-8')
-                            if line.startswith('data: '):
-                                data = json.loads(line[6:])
-                                
-                                if data.get('type') == 'step':
-                                    step_info = f"Tool: {data.get('action')} | Input: {data.get('input')} | Output: {data.get('output')}"
-                                    steps.append(step_info)
-                                    if show_cot:
-                                        st.session_state.messages.append({
-                                            "role": "step",
-                                            "content": step_info,
-                                            "timestamp": datetime.now().isoformat()
-                                        })
-                                
-                                elif data.get('type') == 'response':
+                            if not line.startswith('data: '):
+                                continue
+                            data = json.loads(line[6:])
+
+                            if data.get('type') == 'step':
+                                step_info = f"Tool: {data.get('action')} | Input: {data.get('input')} | Output: {data.get('output')}"
+                                if show_cot:
+                                    render_message(add_message("step", step_info), live_area)
+
+                            elif data.get('type') in ('token', 'response'):
+                                if data.get('type') == 'token':
+                                    agent_response += data.get('content', '')
+                                else:
                                     agent_response = data.get('content', '')
-                                
-                                elif data.get('type') == 'error':
-                                    st.session_state.messages.append({
-                                        "role": "error",
-                                        "content": data.get('message', 'Unknown error'),
-                                        "timestamp": datetime.now().isoformat()
-                                    })
-                    
-                    if agent_response:
-                        st.session_state.messages.append({
-                            "role": "agent",
-                            "content": agent_response,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                else:
-                    st.session_state.messages.append({
-                        "role": "error",
-                        "content": f"HTTP {response.status_code}: {response.text}",
-                        "timestamp": datetime.now().isoformat()
-                    })
-            
+                                if agent_placeholder is None:
+                                    status.empty()
+                                    agent_placeholder = live_area.empty()
+                                agent_placeholder.markdown(
+                                    format_message({"role": "agent", "content": agent_response}),
+                                    unsafe_allow_html=True
+                                )
+
+                            elif data.get('type') == 'error':
+                                render_message(
+                                    add_message("error", data.get('message', 'Unknown error')),
+                                    live_area
+                                )
+
+                            elif data.get('type') == 'done':
+                                break
+
+                        if agent_response:
+                            add_message("agent", agent_response)
+                    else:
+                        render_message(
+                            add_message("error", f"HTTP {response.status_code}: {response.text}"),
+                            live_area
+                        )
+
             else:
                 # Non-streaming request
-                response = requests.post(
-                    api_url,
-                    json=payload,
-                    timeout=30
-                )
-                
+                response = session.post(api_url, json=payload, timeout=30)
+
                 if response.status_code == 200:
                     data = response.json()
-                    
+
                     # Add intermediate steps if available
                     if show_cot and 'intermediate_steps' in data:
                         for step in data['intermediate_steps']:
                             step_info = f"Tool: {step.get('tool')} | Input: {step.get('input')} | Output: {step.get('output')}"
-                            st.session_state.messages.append({
-                                "role": "step",
-                                "content": step_info,
-                                "timestamp": datetime.now().isoformat()
-                            })
-                    
+                            render_message(add_message("step", step_info), live_area)
+
                     # Add agent response
-                    st.session_state.messages.append({
-                        "role": "agent",
-                        "content": data.get('response', 'No response'),
-                        "timestamp": datetime.now().isoformat()
-                    })
+                    render_message(add_message("agent", data.get('response', 'No response')), live_area)
                 else:
-                    st.session_state.messages.append({
-                        "role": "error",
-                        "content": f"HTTP {response.status_code}: {response.text}",
-                        "timestamp": datetime.now().isoformat()
-                    })
-        
-        st.rerun()
-    
-    except Exception as e:
-        st.session_state.messages.append({
-            "role": "error",
-            "content": f"Request failed: {str(e)}",
-            "timestamp": datetime.now().isoformat()
-        })
-        st.rerun()
+                    render_message(
+                        add_message("error", f"HTTP {response.status_code}: {response.text}"),
+                        live_area
+                    )
+
+        except Exception as e:
+            render_message(add_message("error", f"Request failed: {str(e)}"), live_area)
+
+        finally:
+            status.empty()
+
+with load_tab:
+    st.subheader("📈 Load Test")
+    st.caption(f"Fires the example prompts at {api_url} from a pool of concurrent workers")
+
+    st.caption(
+        "⚠️ Any other interaction with the app (Stop, Send, Test Connection, changing a "
+        "setting) stops a running test first, so no other request overlaps with the load."
+    )
+
+    lt_col1, lt_col2, lt_col3 = st.columns(3)
+    with lt_col1:
+        lt_concurrency = st.number_input("Concurrency", min_value=1, max_value=64, value=4)
+    with lt_col2:
+        lt_duration = st.number_input("Duration (seconds)", min_value=5, max_value=600, value=30, step=5)
+    with lt_col3:
+        lt_streaming = st.checkbox("Streaming requests", value=use_streaming, key="load_test_streaming")
+
+    run_col, stop_col, _ = st.columns([1, 1, 4])
+    with run_col:
+        run_load_test = st.button("▶️ Run", type="primary", use_container_width=True)
+    with stop_col:
+        st.button("⏹️ Stop", use_container_width=True)
+
+    status = st.empty()
+    view = {"metrics": st.empty()}
+    chart_col1, chart_col2 = st.columns(2)
+    with chart_col1:
+        st.markdown("**Successful requests & errors (per second)**")
+        view["throughput"] = st.empty()
+    with chart_col2:
+        st.markdown("**TTFB & latency percentiles (ms, trailing 10 s)**")
+        view["latency"] = st.empty()
+    st.markdown("**Error breakdown**")
+    view["errors"] = st.empty()
+
+    if run_load_test:
+        test = LoadTest(
+            api_url,
+            EXAMPLE_PROMPTS,
+            concurrency=int(lt_concurrency),
+            duration=int(lt_duration),
+            stream=lt_streaming
+        )
+        st.session_state.load_test = test
+        test.start()
+
+        while test.running:
+            time.sleep(0.5)
+            test.drain()
+            status.info(f"⏱️ Running... {test.elapsed:.0f}s / {test.duration}s · {len(test.results)} requests")
+            render_load_test(test, view)
+        test.drain()
+
+    test = st.session_state.get('load_test')
+    if test is not None and not test.running:
+        if test.stopped:
+            status.warning(f"⏹️ Stopped after {len(test.results)} requests")
+        else:
+            status.success(f"✅ Finished {len(test.results)} requests")
+
+    if test is not None and test.results:
+        render_load_test(test, view)
+
+        dl_col1, dl_col2, _ = st.columns([1, 1, 4])
+        with dl_col1:
+            st.download_button(
+                "💾 Export JSON",
+                data=test.to_json(),
+                file_name="load_test.json",
+                mime="application/json",
+                use_container_width=True
+            )
+        with dl_col2:
+            st.download_button(
+                "💾 Export CSV",
+                data=test.to_csv(),
+                file_name="load_test.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
 
 # Footer
 st.divider()
@@ -1,9 +1,284 @@
 # hello.py
+"""
+Lima Python VM benchmark suite
+
+Measures how a Lima VM performs on typical NumPy workloads so different VM
+settings (cpus / memory in python.yaml) can be compared:
+
+- vectorized NumPy ops vs pure-Python loops
+- BLAS matmul GFLOPS at different thread counts
+- memory bandwidth (copy / read)
+- array allocation cost
+
+Results are printed and written to a JSON report tagged with the VM's CPU and
+memory configuration.
+
+Usage:
+    python3 hello.py                  # full run, writes bench_<host>_<time>.json
+    python3 hello.py --quick          # smaller sizes, finishes in seconds
+    python3 hello.py --threads 1 2 4  # matmul thread counts to test
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+
 import numpy as np
 
-print("Hello from Lima Python VM!")
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+]
+
+
+def best_time(func, repeats=5):
+    """Run func several times and return the fastest wall-clock time in seconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def read_proc_file(path):
+    """Return the contents of a /proc file, or an empty string if unavailable"""
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def vm_info():
+    """Describe the VM's CPU and memory configuration"""
+    cpu_model = platform.processor() or None
+    for line in read_proc_file("/proc/cpuinfo").splitlines():
+        if line.startswith("model name"):
+            cpu_model = line.split(":", 1)[1].strip()
+            break
+
+    mem_total_mb = None
+    for line in read_proc_file("/proc/meminfo").splitlines():
+        if line.startswith("MemTotal:"):
+            mem_total_mb = int(line.split()[1]) // 1024
+            break
+
+    try:
+        cpus_usable = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus_usable = os.cpu_count()
+
+    return {
+        "hostname": socket.gethostname(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_model": cpu_model,
+        "cpu_count": os.cpu_count(),
+        "cpus_usable": cpus_usable,
+        "mem_total_mb": mem_total_mb,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "blas": blas_info(),
+    }
+
+
+def blas_info():
+    """Name of the BLAS library NumPy was built against, if NumPy can tell us"""
+    try:
+        config = np.show_config(mode="dicts")
+        blas = config["Build Dependencies"]["blas"]
+        return f"{blas.get('name')} {blas.get('version', '')}".strip()
+    except Exception:
+        return None
+
+
+def bench_vectorized(n, repeats):
+    """Compare vectorized NumPy against equivalent pure-Python loops"""
+    data = np.random.default_rng(0).random(n)
+    values = data.tolist()
+
+    cases = {
+        "sum": (lambda: np.sum(data), lambda: sum(values)),
+        "sum_of_squares": (
+            lambda: np.dot(data, data),
+            lambda: sum(x * x for x in values),
+        ),
+        "scale_add": (
+            lambda: data * 2.0 + 1.0,
+            lambda: [x * 2.0 + 1.0 for x in values],
+        ),
+    }
+
+    results = {}
+    for name, (vectorized, loop) in cases.items():
+        numpy_time = best_time(vectorized, repeats)
+        python_time = best_time(loop, max(1, repeats // 2))
+        results[name] = {
+            "n": n,
+            "numpy_ms": numpy_time * 1000,
+            "python_ms": python_time * 1000,
+            "speedup": python_time / numpy_time,
+        }
+    return results
+
+
+def matmul_gflops(size, repeats):
+    """GFLOPS of a size x size float64 matmul in the current process"""
+    rng = np.random.default_rng(0)
+    a = rng.random((size, size))
+    b = rng.random((size, size))
+    a @ b  # warm up the BLAS thread pool
+    seconds = best_time(lambda: a @ b, repeats)
+    return 2 * size ** 3 / seconds / 1e9
+
+
+def bench_matmul(size, repeats, thread_counts):
+    """
+    Measure matmul GFLOPS at each thread count.
+
+    BLAS reads its thread count when NumPy is imported, so each count runs in
+    a fresh interpreter with the thread environment variables set.
+    """
+    results = {}
+    for threads in thread_counts:
+        env = dict(os.environ, **{var: str(threads) for var in THREAD_ENV_VARS})
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--matmul-worker", str(size), str(repeats)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[str(threads)] = {"size": size, "gflops": float(proc.stdout.strip())}
+    return results
+
+
+def bench_memory_bandwidth(size_mb, repeats):
+    """Copy and read bandwidth in GB/s over arrays much larger than the CPU caches"""
+    n = size_mb * 1024 * 1024 // 8
+    src = np.ones(n)
+    dst = np.empty_like(src)
+    nbytes = src.nbytes
+
+    copy_time = best_time(lambda: np.copyto(dst, src), repeats)
+    read_time = best_time(lambda: src.sum(), repeats)
+    return {
+        "array_mb": size_mb,
+        # a copy reads and writes every byte once
+        "copy_gbps": 2 * nbytes / copy_time / 1e9,
+        "read_gbps": nbytes / read_time / 1e9,
+    }
+
+
+def bench_allocation(sizes, repeats):
+    """Cost of allocating arrays with np.empty / np.zeros / np.ones"""
+    results = {}
+    for n in sizes:
+        row = {}
+        for name, alloc in (("empty", np.empty), ("zeros", np.zeros), ("ones", np.ones)):
+            row[f"{name}_us"] = best_time(lambda: alloc(n), repeats) * 1e6
+        results[str(n)] = row
+    return results
+
+
+def default_thread_counts(cpus):
+    """1, 2, 4, ... up to the number of usable CPUs (always including it)"""
+    cpus = cpus or 1
+    counts = []
+    threads = 1
+    while threads < cpus:
+        counts.append(threads)
+        threads *= 2
+    counts.append(cpus)
+    return counts
+
+
+def print_report(report):
+    """Print a human-readable summary of the benchmark report"""
+    vm = report["vm"]
+    print(f"VM: {vm['cpus_usable']} CPUs ({vm['cpu_model']}), {vm['mem_total_mb']} MB RAM")
+    print(f"Python {vm['python']}, NumPy {vm['numpy']}, BLAS: {vm['blas']}")
+
+    print("\nVectorized NumPy vs pure Python:")
+    for name, r in report["vectorized"].items():
+        print(f"  {name:<16} numpy {r['numpy_ms']:9.3f} ms  python {r['python_ms']:9.3f} ms  x{r['speedup']:.0f}")
+
+    print("\nMatmul (float64):")
+    for threads, r in report["matmul"].items():
+        print(f"  {threads:>3} threads  {r['size']}x{r['size']}  {r['gflops']:8.2f} GFLOPS")
+
+    mem = report["memory_bandwidth"]
+    print(f"\nMemory bandwidth ({mem['array_mb']} MB arrays):")
+    print(f"  copy {mem['copy_gbps']:.2f} GB/s  read {mem['read_gbps']:.2f} GB/s")
+
+    print("\nAllocation cost:")
+    for n, r in report["allocation"].items():
+        print(f"  {int(n):>10} float64  empty {r['empty_us']:9.2f} us  zeros {r['zeros_us']:9.2f} us  ones {r['ones_us']:9.2f} us")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="NumPy benchmark suite for Lima Python VMs")
+    parser.add_argument("--quick", action="store_true", help="use small sizes for a fast smoke run")
+    parser.add_argument("--threads", type=int, nargs="+", help="matmul thread counts (default: 1, 2, 4, ... CPUs)")
+    parser.add_argument("--matmul-size", type=int, help="matmul matrix size (default: 2048, quick: 512)")
+    parser.add_argument("--mem-mb", type=int, help="bandwidth array size in MB (default: 512, quick: 64)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed repeats per measurement (best is kept)")
+    parser.add_argument("--label", help="free-form tag stored in the report, e.g. 'cpus=4 memory=8GiB'")
+    parser.add_argument("--output", help="JSON report path (default: bench_<host>_<timestamp>.json)")
+    parser.add_argument("--matmul-worker", nargs=2, type=int, metavar=("SIZE", "REPEATS"), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.matmul_worker:
+        size, repeats = args.matmul_worker
+        print(matmul_gflops(size, repeats))
+        return
+
+    print("Hello from Lima Python VM!\n")
+
+    vector_n = 100_000 if args.quick else 1_000_000
+    matmul_size = args.matmul_size or (512 if args.quick else 2048)
+    mem_mb = args.mem_mb or (64 if args.quick else 512)
+    alloc_sizes = [1_000, 100_000, 1_000_000] if args.quick else [1_000, 100_000, 10_000_000]
+    vm = vm_info()
+    thread_counts = args.threads or default_thread_counts(vm["cpus_usable"])
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "label": args.label,
+        "vm": vm,
+        "settings": {
+            "quick": args.quick,
+            "repeats": args.repeats,
+            "vector_n": vector_n,
+            "matmul_size": matmul_size,
+            "mem_mb": mem_mb,
+        },
+        "vectorized": bench_vectorized(vector_n, args.repeats),
+        "matmul": bench_matmul(matmul_size, args.repeats, thread_counts),
+        "memory_bandwidth": bench_memory_bandwidth(mem_mb, args.repeats),
+        "allocation": bench_allocation(alloc_sizes, args.repeats),
+    }
+
+    print_report(report)
+
+    output = args.output or f"bench_{report['vm']['hostname']}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {output}")
+
 
-# Simple numpy example: create an array and print its sum
-a = np.array([1, 2, 3, 4, 5])
-print("Array:", a)
-print("Sum:", np.sum(a))
+if __name__ == "__main__":
+    main()
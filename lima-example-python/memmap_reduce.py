@@ -0,0 +1,254 @@
+# memmap_reduce.py
+"""
+Out-of-core NumPy reductions on a Lima Python VM
+
+Creates (or opens) an on-disk np.memmap dataset larger than the VM's RAM and
+runs chunked reductions (sum, mean, min/max, histogram) across a process pool.
+Each worker maps only its own slice of the file, so no data is copied between
+processes. Throughput is reported for every chunk size / worker count pair to
+show how far a single VM scales before it needs more CPUs, memory or disk.
+
+Usage:
+    python3 memmap_reduce.py                          # dataset ~1.25x RAM in the VM's temp dir
+    python3 memmap_reduce.py --size-gb 2 --workers 1 2 4 --chunk-mb 8 64
+    python3 memmap_reduce.py --drop-caches            # cold page cache (root)
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from hello import default_thread_counts, vm_info
+
+DTYPE = np.float32
+HIST_RANGE = (0.0, 1.0)
+
+# Keep the dataset on the VM's own disk, not the mounted host /Users directory
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "memmap_dataset.f32")
+
+
+def create_dataset(path, n_items, chunk_items=16 * 1024 * 1024):
+    """Write n_items uniform [0, 1) float32 values to path, one chunk at a time"""
+    data = np.memmap(path, dtype=DTYPE, mode="w+", shape=(n_items,))
+    rng = np.random.default_rng(0)
+    for start in range(0, n_items, chunk_items):
+        stop = min(start + chunk_items, n_items)
+        data[start:stop] = rng.random(stop - start, dtype=DTYPE)
+    data.flush()
+    del data
+
+
+def dataset_items(path):
+    """Number of float32 values stored in an existing dataset file"""
+    return os.path.getsize(path) // np.dtype(DTYPE).itemsize
+
+
+def reduce_slice(path, start, stop, chunk_items, bins):
+    """
+    Reduce items [start, stop) of the dataset in chunks.
+
+    Runs in a worker process: the slice is memory-mapped directly from the file
+    (offset into the file, no copy from the parent) and read chunk by chunk so
+    the resident set stays around one chunk.
+
+    Returns:
+        Dict of partial results: count, sum, min, max and histogram counts
+    """
+    itemsize = np.dtype(DTYPE).itemsize
+    data = np.memmap(path, dtype=DTYPE, mode="r", offset=start * itemsize, shape=(stop - start,))
+
+    total = 0.0
+    lo = np.inf
+    hi = -np.inf
+    hist = np.zeros(bins, dtype=np.int64)
+    for chunk_start in range(0, len(data), chunk_items):
+        chunk = data[chunk_start:chunk_start + chunk_items]
+        total += float(chunk.sum(dtype=np.float64))
+        lo = min(lo, float(chunk.min()))
+        hi = max(hi, float(chunk.max()))
+        hist += np.histogram(chunk, bins=bins, range=HIST_RANGE)[0]
+    del data
+
+    return {"count": stop - start, "sum": total, "min": lo, "max": hi, "hist": hist}
+
+
+def parallel_reduce(pool, path, n_items, workers, chunk_items, bins):
+    """Split the dataset into one contiguous slice per worker and combine the partials"""
+    bounds = np.linspace(0, n_items, workers + 1, dtype=np.int64)
+    futures = [
+        pool.submit(reduce_slice, path, int(start), int(stop), chunk_items, bins)
+        for start, stop in zip(bounds[:-1], bounds[1:])
+        if stop > start
+    ]
+    partials = [future.result() for future in futures]
+
+    count = sum(p["count"] for p in partials)
+    total = sum(p["sum"] for p in partials)
+    return {
+        "count": count,
+        "sum": total,
+        "mean": total / count,
+        "min": min(p["min"] for p in partials),
+        "max": max(p["max"] for p in partials),
+        "hist": sum(p["hist"] for p in partials).tolist(),
+    }
+
+
+def drop_page_cache():
+    """Flush and drop the Linux page cache so the next run reads from disk (needs root)"""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def run_benchmark(path, n_items, worker_counts, chunk_sizes_mb, bins, drop_caches):
+    """Time parallel_reduce for every worker count / chunk size pair"""
+    itemsize = np.dtype(DTYPE).itemsize
+    nbytes = n_items * itemsize
+    runs = []
+    reference = None
+
+    for workers in worker_counts:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # start the worker processes before timing
+            list(pool.map(abs, range(workers)))
+
+            for chunk_mb in chunk_sizes_mb:
+                chunk_items = max(1, chunk_mb * 1024 * 1024 // itemsize)
+                cold = drop_page_cache() if drop_caches else False
+                if drop_caches and not cold:
+                    print("  warning: could not drop the page cache, this run is warm")
+
+                start = time.perf_counter()
+                result = parallel_reduce(pool, path, n_items, workers, chunk_items, bins)
+                seconds = time.perf_counter() - start
+
+                if reference is None:
+                    reference = result
+                run = {
+                    "workers": workers,
+                    "chunk_mb": chunk_mb,
+                    "cold_cache": cold,
+                    "seconds": seconds,
+                    "gbps": nbytes / seconds / 1e9,
+                    "items_per_sec": n_items / seconds,
+                    "matches_first_run": result["hist"] == reference["hist"]
+                    and abs(result["sum"] - reference["sum"]) <= 1e-9 * abs(reference["sum"]),
+                }
+                runs.append(run)
+                print(
+                    f"  workers {workers:>3}  chunk {chunk_mb:>5} MB  "
+                    f"{seconds:8.2f} s  {run['gbps']:6.2f} GB/s"
+                    f"{'  (cold)' if cold else ''}"
+                )
+
+    return runs, reference
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Out-of-core, multi-process NumPy reductions over np.memmap")
+    parser.add_argument("--path", default=DEFAULT_PATH, help=f"dataset file, created if missing (default: {DEFAULT_PATH})")
+    parser.add_argument("--size-gb", type=float, help="dataset size when creating it (default: 1.25x VM RAM)")
+    parser.add_argument("--recreate", action="store_true", help="overwrite an existing dataset file")
+    parser.add_argument("--workers", type=int, nargs="+", help="worker process counts (default: 1, 2, 4, ... CPUs)")
+    parser.add_argument("--chunk-mb", type=int, nargs="+", default=[4, 32, 256], help="chunk sizes in MB")
+    parser.add_argument("--bins", type=int, default=64, help="histogram bins over [0, 1)")
+    parser.add_argument("--drop-caches", action="store_true", help="drop the page cache before every run (root)")
+    parser.add_argument("--label", help="free-form tag stored in the report, e.g. 'cpus=4 memory=4GiB'")
+    parser.add_argument("--output", help="JSON report path (default: memmap_<host>_<timestamp>.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    vm = vm_info()
+    itemsize = np.dtype(DTYPE).itemsize
+
+    if args.size_gb is not None and args.size_gb <= 0:
+        raise SystemExit("--size-gb must be greater than 0")
+    if args.drop_caches and not drop_page_cache():
+        raise SystemExit("--drop-caches needs root to write /proc/sys/vm/drop_caches; rerun with sudo")
+
+    exists = os.path.exists(args.path)
+    if exists and not args.recreate and args.size_gb is not None:
+        raise SystemExit(
+            f"{args.path} already exists, so --size-gb would be ignored; "
+            "pass --recreate to rebuild it at the new size"
+        )
+
+    if args.recreate or not exists:
+        if args.size_gb is not None:
+            nbytes = int(args.size_gb * 1024 ** 3)
+        else:
+            nbytes = int(1.25 * (vm["mem_total_mb"] or 1024) * 1024 ** 2)
+        if nbytes < itemsize:
+            raise SystemExit("--size-gb is too small to hold a single value")
+        free = shutil.disk_usage(os.path.dirname(os.path.abspath(args.path))).free
+        if exists:
+            # the old file is overwritten, so its space is available too
+            free += os.path.getsize(args.path)
+        if nbytes > free:
+            raise SystemExit(
+                f"Not enough disk space for a {nbytes / 1024 ** 3:.1f} GB dataset "
+                f"({free / 1024 ** 3:.1f} GB free); pass a smaller --size-gb or another --path"
+            )
+        print(f"Creating {nbytes / 1024 ** 3:.2f} GB dataset at {args.path}...")
+        start = time.perf_counter()
+        create_dataset(args.path, nbytes // itemsize)
+        print(f"  written in {time.perf_counter() - start:.1f} s")
+
+    file_size = os.path.getsize(args.path)
+    if file_size < itemsize or file_size % itemsize:
+        raise SystemExit(
+            f"{args.path} is empty or truncated ({file_size} bytes, not a whole number of "
+            f"{np.dtype(DTYPE).name} values); pass --recreate to rebuild it"
+        )
+
+    n_items = dataset_items(args.path)
+    dataset_gb = n_items * itemsize / 1024 ** 3
+    ram_gb = (vm["mem_total_mb"] or 0) / 1024
+    print(f"Dataset: {dataset_gb:.2f} GB ({n_items:,} float32), VM RAM: {ram_gb:.2f} GB, CPUs: {vm['cpus_usable']}")
+    if dataset_gb <= ram_gb:
+        print("  note: dataset fits in RAM, so warm runs are served from the page cache")
+
+    worker_counts = args.workers or default_thread_counts(vm["cpus_usable"])
+    print("\nParallel reductions (sum, mean, min/max, histogram):")
+    runs, result = run_benchmark(args.path, n_items, worker_counts, args.chunk_mb, args.bins, args.drop_caches)
+
+    best = max(runs, key=lambda run: run["gbps"])
+    print(f"\nmean {result['mean']:.6f}  min {result['min']:.6f}  max {result['max']:.6f}")
+    print(f"Best: {best['gbps']:.2f} GB/s with {best['workers']} workers, {best['chunk_mb']} MB chunks")
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "label": args.label,
+        "vm": vm,
+        "dataset": {
+            "path": os.path.abspath(args.path),
+            "dtype": np.dtype(DTYPE).name,
+            "items": n_items,
+            "gb": dataset_gb,
+            "larger_than_ram": dataset_gb > ram_gb,
+        },
+        "result": result,
+        "runs": runs,
+        "best": best,
+    }
+    output = args.output or f"memmap_{vm['hostname']}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()